@@ -0,0 +1,84 @@
+import pandas as pd
+import numpy as np
+
+# Correlation and co-movement analytics across CPI sub-groups. The cleaned long
+# frame is pivoted once into a Date x Description matrix; correlations are then
+# computed for all pairs at once from masked matrix products, so gaps in a
+# series only drop the dates that are missing for that pair.
+
+
+def to_matrix(df, sector, metric):
+    df = df[(df['ValueType'] == metric) & df['Description'].str.endswith(f" - {sector}")].copy()
+    df['Date'] = pd.to_datetime(df['Date'])
+    df['Value'] = pd.to_numeric(df['Value'].replace("-", np.nan), errors='coerce')
+    return df.pivot_table(index='Date', columns='Description', values='Value', aggfunc='first', observed=True).sort_index()
+
+
+# Pairwise-complete Pearson correlation of the columns of X (..., n, p) with the
+# columns of Y (n, q); leading dimensions of X are broadcast, giving (..., p, q)
+def pairwise_corr(X, Y, min_periods=3):
+    mx, my = ~np.isnan(X), ~np.isnan(Y)
+    x0, y0 = np.where(mx, X, 0.0), np.where(my, Y, 0.0)
+    mx, my = mx.astype(float), my.astype(float)
+    xt, mxt = np.swapaxes(x0, -1, -2), np.swapaxes(mx, -1, -2)
+
+    n = mxt @ my
+    sx, sy = xt @ my, mxt @ y0
+    sxx, syy = (xt ** 2) @ my, mxt @ (y0 ** 2)
+    sxy = xt @ y0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sxy - sx * sy / n
+        var = (sxx - sx ** 2 / n) * (syy - sy ** 2 / n)
+        corr = cov / np.sqrt(var)
+    corr[(n < min_periods) | ~(var > 0)] = np.nan
+    return np.clip(corr, -1, 1)
+
+
+# Full Description x Description correlation matrix
+def correlation_matrix(wide, min_periods=12):
+    values = wide.to_numpy(dtype=float)
+    return pd.DataFrame(pairwise_corr(values, values, min_periods), index=wide.columns, columns=wide.columns)
+
+
+# Rolling correlation of every column with the target column, from windowed
+# cumulative sums over the pair mask (Date x Description). Like
+# DataFrame.rolling, the first partial windows count once they hold half a window.
+def rolling_correlation(wide, target, window=24):
+    x = wide.to_numpy(dtype=float)
+    y = wide[target].to_numpy(dtype=float)[:, None]
+    m = ~np.isnan(x) & ~np.isnan(y)
+    x0, y0 = np.where(m, x, 0.0), np.where(m, np.broadcast_to(y, x.shape), 0.0)
+
+    def windowed(a):
+        c = np.vstack([np.zeros((1, a.shape[1])), np.cumsum(a, axis=0)])
+        out = c[1:].copy()
+        out[window:] -= c[1:-window]
+        return out
+
+    n = windowed(m.astype(float))
+    sx, sy = windowed(x0), windowed(y0)
+    sxx, syy, sxy = windowed(x0 ** 2), windowed(y0 ** 2), windowed(x0 * y0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sxy - sx * sy / n
+        var = (sxx - sx ** 2 / n) * (syy - sy ** 2 / n)
+        corr = cov / np.sqrt(var)
+    corr[(n < max(3, window // 2)) | ~(var > 0)] = np.nan
+    return pd.DataFrame(np.clip(corr, -1, 1), index=wide.index, columns=wide.columns)
+
+
+# Correlation of every column with the target at lags -max_lag..max_lag. A
+# positive lag k pairs the sub-group at t with the target at t + k, i.e. the
+# sub-group leads. All lags are stacked and computed in one batched product.
+def lagged_correlation(wide, target, max_lag=12, min_periods=12):
+    x = wide.to_numpy(dtype=float)
+    y = wide[target].to_numpy(dtype=float)[:, None]
+    lags = np.arange(-max_lag, max_lag + 1)
+    stacked = np.full((len(lags),) + x.shape, np.nan)
+    for i, k in enumerate(lags):
+        if k >= 0:
+            stacked[i, k:] = x[:len(x) - k]
+        else:
+            stacked[i, :k] = x[-k:]
+    corr = pairwise_corr(stacked, y, min_periods)[..., 0]
+    return pd.DataFrame(corr.T, index=wide.columns, columns=lags).rename_axis(columns='Lag (months)')
@@ -0,0 +1,58 @@
+import os
+import streamlit as st
+
+from data_sources import source_from_settings
+from derived_series import derive_sector
+from shared_cache import read_manifest, read_frame
+
+# Data loaders shared by the dashboard and the pages. st.cache_data and
+# st.cache_resource key on the defining module, so keeping them here means one
+# data source, one loaded frame and one set of mapped files per process.
+
+# Multi-replica mode: when a shared cache directory is configured the data,
+# derived aggregates and figures come from files written by
+# prepare_shared_cache.py and mapped read-only, the data source is not touched
+SHARED_CACHE_DIR = st.secrets.get("shared_cache_dir") or os.environ.get("CPI_SHARED_CACHE_DIR")
+
+# Memory-mapped frames, one set per process and data version
+@st.cache_resource
+def open_shared(freshness_token, name):
+    return read_frame(SHARED_CACHE_DIR, freshness_token, name)
+
+# Data source is picked from st.secrets (data_source = "xlsx" | "dir" | "http"),
+# kept as a resource so the HTTP connection pool and validators survive reruns
+@st.cache_resource
+def get_data_source():
+    return source_from_settings(st.secrets)
+
+# Load file function, cached on the source freshness token so the data is
+# only reloaded when the upstream file or release changes. Entries are bounded
+# so only the current and previous data versions stay in memory
+@st.cache_data(max_entries=2)
+def loadfile(freshness_token):
+    df = get_data_source().fetch()
+    return df
+
+# Token of the current data version, from the manifest in shared mode
+def current_token():
+    if SHARED_CACHE_DIR:
+        return read_manifest(SHARED_CACHE_DIR)["token"]
+    return get_data_source().freshness()
+
+# Source frame for the current data version (shallow copy in shared mode, so
+# column assignments never touch the mapped arrays)
+def base_data(freshness_token):
+    if SHARED_CACHE_DIR:
+        return open_shared(freshness_token, "data").copy(deep=False)
+    return loadfile(freshness_token)
+
+# Derived series (core CPI, rolling averages, momentum, seasonally adjusted)
+# computed once per sector and data version
+@st.cache_data(max_entries=6)
+def load_derived(freshness_token, sector):
+    return derive_sector(loadfile(freshness_token), sector)
+
+def get_derived(freshness_token, sector):
+    if SHARED_CACHE_DIR:
+        return open_shared(freshness_token, f"derived_{sector}")
+    return load_derived(freshness_token, sector)
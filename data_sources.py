@@ -0,0 +1,211 @@
+import pandas as pd
+import io
+import os
+import glob
+import hashlib
+import time
+import threading
+import msoffcrypto
+import requests
+from requests.adapters import HTTPAdapter
+
+# Columns every source has to hand back to the app (long format, one row per
+# Date x Description x ValueType)
+REQUIRED_COLUMNS = ["Date", "Description", "ValueType", "Value", "Weight"]
+
+
+# Base class for all data sources. A source returns the long-format frame from
+# fetch() and a cheap freshness token from freshness(); the token changes only
+# when the upstream data changes, so it can be used as a cache key.
+class DataSource:
+    name = "base"
+
+    def freshness(self):
+        raise NotImplementedError
+
+    def fetch(self):
+        raise NotImplementedError
+
+
+def _stat_token(paths):
+    # Token built from (path, size, mtime) of every file, no file is read
+    parts = []
+    for path in sorted(paths):
+        st_ = os.stat(path)
+        parts.append(f"{path}:{st_.st_size}:{st_.st_mtime_ns}")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+def _check_columns(df, source_name):
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"{source_name} source is missing columns: {', '.join(missing)}")
+    return df
+
+
+# Password protected workbook (the original cpi_streamlit.xlsx input)
+class EncryptedXlsxSource(DataSource):
+    name = "xlsx"
+
+    def __init__(self, path, password, sheet_name="Sheet1"):
+        self.path = path
+        self.password = password
+        self.sheet_name = sheet_name
+
+    def freshness(self):
+        return _stat_token([self.path])
+
+    def fetch(self):
+        excel_content = io.BytesIO()
+        with open(self.path, 'rb') as f:
+            excel = msoffcrypto.OfficeFile(f)
+            excel.load_key(self.password)
+            excel.decrypt(excel_content)
+
+        # Loading data from excel file
+        df = pd.read_excel(excel_content, sheet_name=self.sheet_name)
+        return _check_columns(df, self.name)
+
+
+# Directory of plain CSV and/or Parquet files in the same long format
+class TabularDirSource(DataSource):
+    name = "dir"
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _files(self):
+        files = glob.glob(os.path.join(self.directory, "*.csv")) + glob.glob(os.path.join(self.directory, "*.parquet"))
+        if not files:
+            raise FileNotFoundError(f"No CSV or Parquet files found in {self.directory}")
+        return sorted(files)
+
+    def freshness(self):
+        return _stat_token(self._files())
+
+    def fetch(self):
+        frames = []
+        for path in self._files():
+            if path.endswith(".parquet"):
+                frames.append(pd.read_parquet(path))
+            else:
+                frames.append(pd.read_csv(path))
+        df = pd.concat(frames, ignore_index=True)
+        return _check_columns(df, self.name)
+
+
+# Convert the CPI release JSON into the long format used by the app.
+# Payload layout (modeled on the official CPI release):
+#   {"data": [{"year": 2024, "month": "January", "sector": "Rural",
+#              "description": "A.1) Food and beverages", "weight": 54.18,
+#              "index": 190.3, "inflation": 8.1}, ...]}
+def release_to_frame(payload):
+    records = pd.DataFrame(payload.get("data", []))
+    if records.empty:
+        return pd.DataFrame(columns=REQUIRED_COLUMNS)
+
+    records["Date"] = pd.to_datetime(records["year"].astype(str) + "-" + records["month"].astype(str), format="%Y-%B")
+    records["Description"] = records["description"] + " - " + records["sector"]
+    records = records.rename(columns={"weight": "Weight", "index": "Index", "inflation": "Inflation"})
+
+    df = records.melt(id_vars=["Date", "Description", "Weight"], value_vars=["Index", "Inflation"],
+                      var_name="ValueType", value_name="Value")
+    return df[REQUIRED_COLUMNS]
+
+
+# HTTP JSON source. One pooled session is kept per source and refreshes use
+# conditional requests (ETag / Last-Modified), so an unchanged release costs a
+# single 304 round trip. Checks are throttled to one per check_interval seconds.
+# One instance is shared by all sessions: once a payload is loaded, a session
+# that finds another one refreshing just uses the cached token instead of
+# waiting, and conditional checks use a short timeout with a single retry.
+# A failed check keeps serving the last good payload.
+class HttpJsonSource(DataSource):
+    name = "http"
+
+    def __init__(self, url, params=None, headers=None, timeout=30, check_timeout=5, check_interval=300, pool_size=4):
+        self.url = url
+        self.params = params or {}
+        self.timeout = timeout
+        self.check_timeout = check_timeout
+        self.check_interval = check_interval
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self._etag = None
+        self._last_modified = None
+        self._payload = None
+        self._token = None
+        self._checked_at = 0.0
+        self.last_status = None
+        self.lock = threading.Lock()
+
+    # Caller holds self.lock
+    def _refresh(self):
+        conditional = {}
+        if self._etag:
+            conditional["If-None-Match"] = self._etag
+        if self._last_modified:
+            conditional["If-Modified-Since"] = self._last_modified
+
+        # The first load may be slow, a conditional check should not be
+        timeout = self.check_timeout if self._payload is not None else self.timeout
+        response = self.session.get(self.url, params=self.params, headers=conditional, timeout=timeout)
+        self._checked_at = time.monotonic()
+        self.last_status = response.status_code
+        if response.status_code == 304 and self._payload is not None:
+            return
+        response.raise_for_status()
+
+        self._etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+        self._payload = response.json()
+        # Fall back to a content hash when the server sends no validators
+        self._token = self._etag or self._last_modified or hashlib.sha1(response.content).hexdigest()
+
+    def _due(self):
+        return self._payload is None or time.monotonic() - self._checked_at >= self.check_interval
+
+    def freshness(self):
+        if not self._due():
+            return self._token
+        # Only block when there is nothing to serve yet
+        if not self.lock.acquire(blocking=self._payload is None):
+            return self._token
+        try:
+            if self._due():
+                try:
+                    self._refresh()
+                except (requests.RequestException, ValueError):
+                    if self._payload is None:
+                        raise
+                    # Upstream is down, keep the cached data and retry after the next interval
+                    self._checked_at = time.monotonic()
+            return self._token
+        finally:
+            self.lock.release()
+
+    def fetch(self):
+        with self.lock:
+            if self._payload is None:
+                self._refresh()
+            payload = self._payload
+        return _check_columns(release_to_frame(payload), self.name)
+
+
+# Build the configured source from st.secrets style settings.
+# data_source = "xlsx" (default) | "dir" | "http"
+def source_from_settings(settings):
+    kind = settings.get("data_source", "xlsx")
+    if kind == "xlsx":
+        return EncryptedXlsxSource(settings.get("xlsx_path", "cpi_streamlit.xlsx"), settings["db_password"])
+    if kind == "dir":
+        return TabularDirSource(settings["data_dir"])
+    if kind == "http":
+        return HttpJsonSource(settings["cpi_api_url"], check_interval=int(settings.get("cpi_api_check_interval", 300)))
+    raise ValueError(f"Unknown data_source '{kind}', expected one of: xlsx, dir, http")
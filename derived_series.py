@@ -0,0 +1,113 @@
+import pandas as pd
+import numpy as np
+
+# Main groups left in core CPI once food and fuel are taken out
+CORE_GROUPS = [
+    "A.2) Pan, tobacco and intoxicants",
+    "A.3) Clothing and footwear",
+    "A.4) Housing",
+    "A.6) Miscellaneous",
+]
+CORE_NAME = "C) Core CPI (excl. food and fuel)"
+
+# Derived measures and the metric (ValueType) they are expressed in.
+# Label is appended to the base description, e.g. "A.1) Food and beverages - Rural [3M avg]"
+MEASURES = {
+    "Core CPI": ["Index", "Inflation"],
+    "3M avg": ["Inflation"],
+    "6M avg": ["Inflation"],
+    "12M avg": ["Inflation"],
+    "Momentum": ["Inflation"],
+    "SA": ["Index"],
+}
+
+
+def _pivot(df, value_type):
+    sub = df[df['ValueType'] == value_type]
+    return sub.pivot_table(index='Date', columns='Description', values='Value', aggfunc='first', observed=True).sort_index()
+
+
+# Seasonal adjustment by ratio to a centred 2x12 moving average; the seasonal
+# factors are the per calendar month means of that ratio, normalised to 1
+def seasonally_adjust(idx):
+    ma = idx.rolling(12).mean().rolling(2).mean().shift(-6)
+    ratio = idx / ma
+    seasonal = ratio.groupby(ratio.index.month).mean()
+    seasonal = seasonal / seasonal.mean()
+    factors = seasonal.reindex(idx.index.month).to_numpy()
+    return idx / factors
+
+
+# Annualised month on month change in percent
+def momentum(idx):
+    return ((idx / idx.shift(1)) ** 12 - 1) * 100
+
+
+def _melt(wide, value_type, measure, weights, suffix):
+    long = wide.rename(columns=lambda d: f"{d}{suffix}").reset_index().melt(id_vars='Date', var_name='Description', value_name='Value')
+    long['ValueType'] = value_type
+    long['Measure'] = measure
+    long['Weight'] = long['Description'].str.replace(suffix, "", regex=False).map(weights)
+    return long
+
+
+# Compute every derived measure for one sector ("Rural", "Urban" or "Combined")
+# as whole-matrix operations over the Date x Description grid. Returns long
+# rows in the same layout as the source data plus a Measure column.
+def derive_sector(df, sector):
+    df = df[df['Description'].str.endswith(f" - {sector}")].copy()
+    df['Date'] = pd.to_datetime(df['Date'])
+    df['Value'] = pd.to_numeric(df['Value'].replace("-", np.nan), errors='coerce')
+
+    weights = df.groupby('Description', observed=True)['Weight'].first()
+    idx = _pivot(df, "Index")
+    infl = _pivot(df, "Inflation")
+
+    # Core index is the weight-averaged index of the non food, non fuel groups
+    core_cols = [f"{group} - {sector}" for group in CORE_GROUPS if f"{group} - {sector}" in idx.columns]
+    core_name = f"{CORE_NAME} - {sector}"
+    if core_cols:
+        w = weights.reindex(core_cols).to_numpy(dtype=float)
+        values = idx[core_cols].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        core = np.where(valid, values, 0.0) @ w / np.where(valid, w, 0.0).sum(axis=1)
+        core[~valid.any(axis=1)] = np.nan
+        idx[core_name] = core
+        infl[core_name] = idx[core_name].pct_change(12, fill_method=None) * 100
+        weights[core_name] = w.sum()
+
+    frames = []
+    if core_cols:
+        frames.append(_melt(idx[[core_name]], "Index", "Core CPI", weights, ""))
+        frames.append(_melt(infl[[core_name]], "Inflation", "Core CPI", weights, ""))
+    for window in (3, 6, 12):
+        label = f"{window}M avg"
+        frames.append(_melt(infl.rolling(window, min_periods=window).mean(), "Inflation", label, weights, f" [{label}]"))
+    frames.append(_melt(momentum(idx), "Inflation", "Momentum", weights, " [Momentum]"))
+    frames.append(_melt(seasonally_adjust(idx), "Index", "SA", weights, " [SA]"))
+
+    derived = pd.concat(frames, ignore_index=True)
+    derived = derived.replace([np.inf, -np.inf], np.nan).dropna(subset=['Value'])
+    derived['Value'] = derived['Value'].round(2)
+    return derived[['Date', 'Description', 'ValueType', 'Value', 'Weight', 'Measure']]
+
+
+# Order list entries for derived descriptions, each placed after its base
+def expand_order(order_list, sector, measures):
+    expanded = []
+    for item in order_list:
+        expanded.append(item)
+        expanded.extend(f"{item} [{m}]" for m in measures if m != "Core CPI")
+    if "Core CPI" in measures:
+        core_item = f"{CORE_NAME} - {sector}"
+        expanded.append(core_item)
+        expanded.extend(f"{core_item} [{m}]" for m in measures if m != "Core CPI")
+    return expanded
+
+
+# Keep only the rows of the chosen measures; core variants need "Core CPI" too
+def select_measures(derived, measures):
+    keep = derived['Measure'].isin(measures)
+    if "Core CPI" not in measures:
+        keep &= ~derived['Description'].str.startswith(CORE_NAME)
+    return derived[keep]
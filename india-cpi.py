@@ -3,12 +3,17 @@ from datetime import datetime
 import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
+import plotly.io as pio
 import streamlit as st
-import io
-import msoffcrypto
 import numpy as np
 import re
 import time
+from cpi_data import SHARED_CACHE_DIR, current_token, base_data, get_derived
+from reweighting import leaf_weights, reweight
+from derived_series import expand_order, select_measures, MEASURES, CORE_NAME
+from validation import validate, summarize
+from profiling import RerunProfiler, profiling_busy
+from shared_cache import figure_key, get_figure, put_figure
 
 pd.set_option('future.no_silent_downcasting', True)
 pd.set_option('display.max_columns', None)
@@ -37,22 +42,18 @@ hide_st_style = '''
 '''
 st.markdown(hide_st_style, unsafe_allow_html=True)
 
-# Load file function
-@st.cache_data
-def loadfile():
-    password = st.secrets["db_password"]
-    excel_content = io.BytesIO()
-    with open("cpi_streamlit.xlsx", 'rb') as f:
-        excel = msoffcrypto.OfficeFile(f)
-        excel.load_key(password)
-        excel.decrypt(excel_content)
-    
-    # Loading data from excel file
-    df = pd.read_excel(excel_content, sheet_name="Sheet1")
-    return df
+# Data-quality report, built once per data version at ingest
+@st.cache_data(max_entries=2)
+def load_report(freshness_token):
+    return validate(base_data(freshness_token))
+
+# What-if basket, recomputed once per sector and weight set
+@st.cache_data(max_entries=16)
+def load_whatif(freshness_token, sector, weight_items):
+    return reweight(base_data(freshness_token), sector, dict(weight_items))
 
 # Function to get description order and append weights
-def get_description_order(sector_type, df):
+def get_description_order(sector_type, df, derived_measures=()):
     order_dict = {
         "Rural": [
             "A) General Index - Rural",
@@ -149,7 +150,7 @@ def get_description_order(sector_type, df):
     # Add weights to the descriptions
     df['Description'] = df.apply(lambda row: f"{row['Description']} ({row['Weight']:.2f})", axis=1)
     
-    order_list = order_dict.get(sector_type, [])
+    order_list = expand_order(order_dict.get(sector_type, []), sector_type, derived_measures)
     new_order_list = []
     for item in order_list:
         matches = df[df['Description'].str.contains(re.escape(item.split(' - ')[0]))]
@@ -161,275 +162,387 @@ def get_description_order(sector_type, df):
     
     return new_order_list
 
-# Main Program Starts Here
-df = loadfile()
-
-# Ensuring the Date column is of datetime type
-df['Date'] = pd.to_datetime(df['Date'])
-
-# Sorting dataframe by Date to ensure proper animation sequence
-df = df.sort_values(by='Date')
-
-# Convert Date column to string without time
-df['Date_str'] = df['Date'].dt.strftime('%d-%m-%Y')
-
-df["Value"] = df["Value"].replace("-", np.nan, regex=True)
-
-# Format the Value column to two decimal places and keep it as a float
-df['Value'] = df['Value'].astype(float).round(2)
-
-metric_types = ["Index", "Inflation"]
-sector_types = ["All", "Rural", "Urban", "Combined"]
-
-# Place the "Play" button at the top of the sidebar
-play_button = st.sidebar.button("Play")
-pause_button = st.sidebar.button("Pause")
-
-slider_placeholder = st.sidebar.empty()
-
-selected_metric_type = st.sidebar.selectbox("Select Metric Type", metric_types)
-
-def format_text(row, metric_type):
-    value = f"<b>{row['Value']:.1f}</b>"
-    if metric_type == "Inflation":
-        value += "%"
-    return f"{value} <span style='font-size:70%'> (w {row['Weight']:.2f})</span>"
-
-# Create a column to hold the value information along with weights
-df['Text'] = df.apply(lambda row: format_text(row, selected_metric_type), axis=1)
-
-# Filter dataframe based on selected metric type
-df_filtered = df[df['ValueType'] == selected_metric_type].copy()
-
-df_filtered = df_filtered.replace("", np.nan).dropna()
-
-# Define main categories for each sector type
-main_categories = [
-    "A) General Index - Rural", "A.1) Food and beverages - Rural", 
-    "A.2) Pan, tobacco and intoxicants - Rural", 
-    "A.3) Clothing and footwear - Rural", "A.4) Housing - Rural", 
-    "A.5) Fuel and light - Rural", "A.6) Miscellaneous - Rural",
-    "A) General Index - Urban", "A.1) Food and beverages - Urban", 
-    "A.2) Pan, tobacco and intoxicants - Urban", 
-    "A.3) Clothing and footwear - Urban", "A.4) Housing - Urban", 
-    "A.5) Fuel and light - Urban", "A.6) Miscellaneous - Urban",
-    "A) General Index - Combined", "A.1) Food and beverages - Combined", 
-    "A.2) Pan, tobacco and intoxicants - Combined", 
-    "A.3) Clothing and footwear - Combined", "A.4) Housing - Combined", 
-    "A.5) Fuel and light - Combined", "A.6) Miscellaneous - Combined",
-    "B) Consumer Food Price Index - Rural",
-    "B) Consumer Food Price Index - Urban",
-    "B) Consumer Food Price Index - Combined",
-]
-
-# Additional filter for Main Cat, Sub Cat, or Both
-category_types = ["Both", "Main Cat", "Sub Cat"]
-selected_category_type = st.sidebar.selectbox("Select Category Type", category_types)
-
-if selected_category_type == "Main Cat":
-    df_filtered = df_filtered[df_filtered['Description'].apply(lambda x: any(main in x for main in main_categories) or "General Index" in x or "Housing" in x
-        or "Pan, tobacco and intoxicants" in x or "Fuel and light" in x)]
-elif selected_category_type == "Sub Cat":
-    df_filtered = df_filtered[df_filtered['Description'].apply(lambda x: not any(main in x for main in main_categories) or "General Index" in x or "Housing" in x
-        or "Pan, tobacco and intoxicants" in x or "Fuel and light" in x)]
-
-selected_sector_type = st.sidebar.selectbox("Select Sector Type", sector_types, index=3)
-
-# Prepare options for the multiselect based on sector type selection
-if selected_sector_type == "All":
-    description_options = df_filtered['Description'].unique().tolist()
-    selected_description = st.sidebar.multiselect("Select Description to Display", description_options)
-else:
-    description_options = df_filtered[df_filtered['Description'].str.contains(re.escape(selected_sector_type))]['Description'].unique().tolist()
-    selected_description = st.sidebar.multiselect("Select Description to Display", description_options, default=description_options)
-
-# Filter dataframe based on selected main description
-if selected_description:
-    df_filtered = df_filtered[df_filtered['Description'].isin(selected_description)]
-
-# Calculate the overall min and max values for the 'Value' column in the entire dataset
-overall_min_value = df_filtered['Value'].min()
-overall_max_value = df_filtered['Value'].max()
-
-# Ensure the order of descriptions does not change when 'All' is selected
-if selected_sector_type != "All":
-    # Reorder the Description column based on the selected sector type
-    description_order = get_description_order(selected_sector_type, df_filtered)
-    if description_order:
-        df_filtered['Description'] = pd.Categorical(df_filtered['Description'], categories=description_order, ordered=True)
-        df_filtered = df_filtered.sort_values('Description')  # Sort the dataframe by Description to ensure the order is maintained
-else:
-    # Preserve the order of selected descriptions
-    selected_description_order = selected_description
-    df_filtered['Description'] = pd.Categorical(df_filtered['Description'], categories=selected_description_order, ordered=True)
-    df_filtered = df_filtered.sort_values('Description')  # Sort the dataframe by Description to ensure the order is maintained
-
-# Check if there is any data left after filtering
-if selected_sector_type == "All" and not selected_description:
-    st.write("Please select at least one description to display the data.")
-elif df_filtered.empty:
-    st.write("No data available for the selected filters.")
-else:
-    # Create the 'Weighted Average' column
-    df_filtered['Weighted Average'] = df_filtered['Value'] * df_filtered['Weight'] / 100
-    min_weighted_avg = df_filtered['Weighted Average'].min()
-    max_weighted_avg = df_filtered['Weighted Average'].max()
-
-    # Manually set the date range in the sidebar
-    unique_dates = df_filtered['Date'].dt.date.unique()
-    unique_dates = sorted(unique_dates)  # Ensure dates are sorted
-
-    title_placeholder = st.empty()
-    
-    # Placeholder for the plot
-    plot_placeholder = st.empty()
-
-    def update_plot(selected_date):
-        df_filtered_date = df_filtered[df_filtered['Date'].dt.date == selected_date]
-
-        fig = make_subplots(rows=1, cols=2, shared_yaxes=True, column_widths=[0.75, 0.25], horizontal_spacing=0.01)
-
-        # Create scatter plot
-        scatter_fig = px.scatter(df_filtered_date, x="Value", y="Description", color="Description", size_max=20, text="Text")
-        scatter_fig.update_traces(marker=dict(size=20))
-        scatter_fig.update_traces(marker=dict(line=dict(width=1, color='black')), textposition='middle right', textfont=dict(family='Arial', size=15, color='black', weight='bold'))
-        scatter_fig.update_layout(showlegend=False, xaxis_title="Value of " + selected_metric_type)
+# Admin-only profiling: "Profile next rerun" arms a profiler that records the
+# following rerun (loadfile, filtering, get_description_order, update_plot)
+admin_token = st.secrets.get("admin_token")
+is_admin = bool(admin_token) and st.query_params.get("admin") == admin_token
 
-        # Map colors from scatter plot to bar plot
-        color_map = {desc: trace.marker.color for desc, trace in zip(df_filtered_date['Description'], scatter_fig.data)}
+rerun_profiler = None
+if is_admin and st.session_state.get("profile_armed"):
+    st.session_state.profile_armed = False
+    rerun_profiler = RerunProfiler(st.secrets.get("profile_dir", "profiles"))
+    if not rerun_profiler.start():
+        rerun_profiler = None
+        st.sidebar.warning("Another rerun is being profiled in this process, try again later")
 
-        # Create bar plot
-        bar_fig = px.bar(df_filtered_date, x="Weighted Average", y="Description", orientation='h', text_auto='.2f')
-        bar_fig.update_traces(textposition='outside', textfont=dict(size=15, family='Arial', color='black', weight='bold'))
-        bar_fig.update_traces(marker=dict(line=dict(width=2, color='black')))
-        bar_fig.update_traces(marker_color=[color_map[desc] for desc in df_filtered_date['Description']])
-        bar_fig.update_layout(showlegend=False, xaxis_title="Weighted Average", yaxis=dict(showticklabels=False))
-
-        # Update the y-axis tick labels to be bold
-        fig.update_yaxes(tickfont=dict(size=15, family='Arial', color='black', weight='bold'), row=1, col=1)
-
-        for trace in scatter_fig.data:
-            fig.add_trace(trace, row=1, col=1)
-
-        for trace in bar_fig.data:
-            fig.add_trace(trace, row=1, col=2)
-
-        # Create a reversed list of categories (descriptions)
-        categories_reversed = df_filtered_date['Description'].tolist()[::-1]
-
-        # Reverse the order of the y-axis for both the scatter plot and the bar plot
-        fig.update_yaxes(categoryorder='array', categoryarray=categories_reversed, row=1, col=1)
-        fig.update_yaxes(categoryorder='array', categoryarray=categories_reversed, row=1, col=2)
+# Main Program Starts Here
+try:
+    freshness_token = current_token()
+    df = base_data(freshness_token)
+
+    # Surface data-quality issues instead of letting the cleaning below drop them silently
+    quality_report = load_report(freshness_token)
+    quality_summary = summarize(quality_report)
+    with st.sidebar.expander(f"Data Quality ({quality_summary['Issues'].sum()} issues)"):
+        st.dataframe(quality_summary, hide_index=True)
+        for check, rows in quality_report.items():
+            if not rows.empty:
+                st.caption(check)
+                st.dataframe(rows, hide_index=True)
+
+    # Ensuring the Date column is of datetime type
+    df['Date'] = pd.to_datetime(df['Date'])
+
+    # Sorting dataframe by Date to ensure proper animation sequence
+    df = df.sort_values(by='Date')
+
+    # Convert Date column to string without time
+    df['Date_str'] = df['Date'].dt.strftime('%d-%m-%Y')
+
+    df["Value"] = df["Value"].replace("-", np.nan, regex=True)
+
+    # Format the Value column to two decimal places and keep it as a float
+    df['Value'] = df['Value'].astype(float).round(2)
+
+    metric_types = ["Index", "Inflation"]
+    sector_types = ["All", "Rural", "Urban", "Combined"]
+
+    # Place the "Play" button at the top of the sidebar
+    play_button = st.sidebar.button("Play")
+    pause_button = st.sidebar.button("Pause")
+
+    slider_placeholder = st.sidebar.empty()
+
+    selected_metric_type = st.sidebar.selectbox("Select Metric Type", metric_types)
+
+    # What-if weights: edit the leaf weights of one sector and every aggregate
+    # index, inflation and weight of that sector is recomputed from them
+    with st.sidebar.expander("What-if Weights"):
+        whatif_enabled = st.checkbox("Use custom basket weights")
+        whatif_sector = st.selectbox("Basket Sector", ["Rural", "Urban", "Combined"], index=2)
+        base_weights = leaf_weights(df, whatif_sector)
+        edited_weights = st.data_editor(base_weights.rename_axis('Description').reset_index(), disabled=['Description'], hide_index=True, key=f"whatif_{whatif_sector}")
+
+        # Blank weights leave a sub-group out of the basket
+        edited = pd.to_numeric(edited_weights['Weight'], errors='coerce')
+        whatif_applied = False
+        if whatif_enabled and ((edited < 0).any() or not edited.sum() > 0):
+            st.error("Weights must be non-negative and add up to more than zero.")
+        elif whatif_enabled:
+            whatif_applied = True
+            weight_items = tuple(zip(edited_weights['Description'], edited.astype(float)))
+            whatif_frame, whatif_contributions, basket_weights = load_whatif(freshness_token, whatif_sector, weight_items)
+
+            # Headline comparison across the whole history
+            headline = [d for d in whatif_frame['Description'].unique() if d.startswith("A) ")]
+            baseline_infl = df[(df['ValueType'] == "Inflation") & df['Description'].isin(headline)].set_index('Date')['Value']
+            whatif_infl = whatif_frame[(whatif_frame['ValueType'] == "Inflation") & whatif_frame['Description'].isin(headline)].set_index('Date')['Value']
+            st.line_chart(pd.DataFrame({"Published": baseline_infl, "What-if": whatif_infl}))
+            st.caption("Contributions to headline inflation, latest month (pp)")
+            st.bar_chart(whatif_contributions.dropna(how='all').iloc[-1:].T.rename(columns=lambda d: "pp"))
+
+            # Swap the recomputed values and weights into the main frame. The
+            # aggregate rows are overwritten as they are, missing values
+            # included, and leaves left out of the basket lose their weight
+            keys = ['Date', 'Description', 'ValueType']
+            row_keys = pd.MultiIndex.from_frame(df[keys])
+            recomputed = whatif_frame.set_index(keys)[['Value', 'Weight']]
+            rows = row_keys.isin(recomputed.index)
+            df.loc[rows, ['Value', 'Weight']] = recomputed.reindex(row_keys[rows]).to_numpy()
+            leaf_rows = df['Description'].isin(base_weights.index)
+            df.loc[leaf_rows, 'Weight'] = df.loc[leaf_rows, 'Description'].map(basket_weights)
+
+    # Derived series are appended as extra descriptions of the selected metric
+    derived_options = [m for m, value_types in MEASURES.items() if selected_metric_type in value_types]
+    selected_derived = st.sidebar.multiselect("Add Derived Series", derived_options)
+
+    if selected_derived:
+        derived = pd.concat([get_derived(freshness_token, sector) for sector in ["Rural", "Urban", "Combined"]], ignore_index=True)
+        derived = select_measures(derived, selected_derived).drop(columns='Measure')
+        derived['Date_str'] = derived['Date'].dt.strftime('%d-%m-%Y')
+        df = pd.concat([df, derived], ignore_index=True).sort_values(by='Date')
+
+    def format_text(row, metric_type):
+        value = f"<b>{row['Value']:.1f}</b>"
+        if metric_type == "Inflation":
+            value += "%"
+        return f"{value} <span style='font-size:70%'> (w {row['Weight']:.2f})</span>"
+
+    # Create a column to hold the value information along with weights
+    df['Text'] = df.apply(lambda row: format_text(row, selected_metric_type), axis=1)
+
+    # Filter dataframe based on selected metric type
+    df_filtered = df[df['ValueType'] == selected_metric_type].copy()
+
+    df_filtered = df_filtered.replace("", np.nan).dropna()
+
+    # Define main categories for each sector type
+    main_categories = [
+        "A) General Index - Rural", "A.1) Food and beverages - Rural", 
+        "A.2) Pan, tobacco and intoxicants - Rural", 
+        "A.3) Clothing and footwear - Rural", "A.4) Housing - Rural", 
+        "A.5) Fuel and light - Rural", "A.6) Miscellaneous - Rural",
+        "A) General Index - Urban", "A.1) Food and beverages - Urban", 
+        "A.2) Pan, tobacco and intoxicants - Urban", 
+        "A.3) Clothing and footwear - Urban", "A.4) Housing - Urban", 
+        "A.5) Fuel and light - Urban", "A.6) Miscellaneous - Urban",
+        "A) General Index - Combined", "A.1) Food and beverages - Combined", 
+        "A.2) Pan, tobacco and intoxicants - Combined", 
+        "A.3) Clothing and footwear - Combined", "A.4) Housing - Combined", 
+        "A.5) Fuel and light - Combined", "A.6) Miscellaneous - Combined",
+        "B) Consumer Food Price Index - Rural",
+        "B) Consumer Food Price Index - Urban",
+        "B) Consumer Food Price Index - Combined",
+        f"{CORE_NAME} - Rural", f"{CORE_NAME} - Urban", f"{CORE_NAME} - Combined",
+    ]
+
+    # Additional filter for Main Cat, Sub Cat, or Both
+    category_types = ["Both", "Main Cat", "Sub Cat"]
+    selected_category_type = st.sidebar.selectbox("Select Category Type", category_types)
+
+    if selected_category_type == "Main Cat":
+        df_filtered = df_filtered[df_filtered['Description'].apply(lambda x: any(main in x for main in main_categories) or "General Index" in x or "Housing" in x
+            or "Pan, tobacco and intoxicants" in x or "Fuel and light" in x)]
+    elif selected_category_type == "Sub Cat":
+        df_filtered = df_filtered[df_filtered['Description'].apply(lambda x: not any(main in x for main in main_categories) or "General Index" in x or "Housing" in x
+            or "Pan, tobacco and intoxicants" in x or "Fuel and light" in x)]
+
+    selected_sector_type = st.sidebar.selectbox("Select Sector Type", sector_types, index=3)
+
+    # Prepare options for the multiselect based on sector type selection
+    if selected_sector_type == "All":
+        description_options = df_filtered['Description'].unique().tolist()
+        selected_description = st.sidebar.multiselect("Select Description to Display", description_options)
+    else:
+        description_options = df_filtered[df_filtered['Description'].str.contains(re.escape(selected_sector_type))]['Description'].unique().tolist()
+        selected_description = st.sidebar.multiselect("Select Description to Display", description_options, default=description_options)
+
+    # Filter dataframe based on selected main description
+    if selected_description:
+        df_filtered = df_filtered[df_filtered['Description'].isin(selected_description)]
+
+    # Calculate the overall min and max values for the 'Value' column in the entire dataset
+    overall_min_value = df_filtered['Value'].min()
+    overall_max_value = df_filtered['Value'].max()
+
+    # Ensure the order of descriptions does not change when 'All' is selected
+    if selected_sector_type != "All":
+        # Reorder the Description column based on the selected sector type
+        description_order = get_description_order(selected_sector_type, df_filtered, selected_derived)
+        if description_order:
+            df_filtered['Description'] = pd.Categorical(df_filtered['Description'], categories=description_order, ordered=True)
+            df_filtered = df_filtered.sort_values('Description')  # Sort the dataframe by Description to ensure the order is maintained
+    else:
+        # Preserve the order of selected descriptions
+        selected_description_order = selected_description
+        df_filtered['Description'] = pd.Categorical(df_filtered['Description'], categories=selected_description_order, ordered=True)
+        df_filtered = df_filtered.sort_values('Description')  # Sort the dataframe by Description to ensure the order is maintained
 
-        # Update the layout for the combined figure
-        fig.update_xaxes(row=1, col=1, range=[overall_min_value, overall_max_value * 1.05], fixedrange=True, showline=True, linewidth=1.5, linecolor='grey', mirror=True, showgrid=True, gridcolor='lightgrey')
-        fig.update_yaxes(row=1, col=1, tickfont=dict(size=15),fixedrange=True, showline=True, linewidth=1.5, linecolor='grey', mirror=True, showgrid=True, gridcolor='lightgrey')
+    # Check if there is any data left after filtering
+    if selected_sector_type == "All" and not selected_description:
+        st.write("Please select at least one description to display the data.")
+    elif df_filtered.empty:
+        st.write("No data available for the selected filters.")
+    else:
+        # Create the 'Weighted Average' column
+        df_filtered['Weighted Average'] = df_filtered['Value'] * df_filtered['Weight'] / 100
+        min_weighted_avg = df_filtered['Weighted Average'].min()
+        max_weighted_avg = df_filtered['Weighted Average'].max()
 
-        if selected_metric_type == "Inflation":
-            fig.update_xaxes(row=1, col=2, range=[min_weighted_avg*3, max_weighted_avg * 1.4],fixedrange=True, showline=True, linewidth=1.5, linecolor='grey', mirror=True, showgrid=True, gridcolor='lightgrey')
-        else:
-            fig.update_xaxes(row=1, col=2, range=[0, max_weighted_avg * 1.4],fixedrange=True, showline=True, linewidth=1.5, linecolor='grey', mirror=True, showgrid=True, gridcolor='lightgrey')
+        # Manually set the date range in the sidebar
+        unique_dates = df_filtered['Date'].dt.date.unique()
+        unique_dates = sorted(unique_dates)  # Ensure dates are sorted
 
-        fig.update_yaxes(row=1, col=2, fixedrange=True, showline=True, linewidth=1.5, linecolor='grey', mirror=True, showgrid=True, gridcolor='lightgrey')
+        title_placeholder = st.empty()
+    
+        # Placeholder for the plot
+        plot_placeholder = st.empty()
+
+        # Only the default views (one sector with its default descriptions, no derived
+        # series or what-if weights) are shared, so the figure files per data version
+        # are bounded by metric x category x sector x date. Custom selections are
+        # rendered per session.
+        share_figures = (SHARED_CACHE_DIR and not whatif_applied and not selected_derived
+                         and selected_sector_type != "All" and selected_description == description_options)
+        view_key = (selected_metric_type, selected_category_type, selected_sector_type)
+
+        def update_plot(selected_date):
+            if share_figures:
+                cache_key = figure_key(*view_key, selected_date)
+                payload = get_figure(SHARED_CACHE_DIR, freshness_token, cache_key)
+                if payload is not None:
+                    plot_placeholder.plotly_chart(pio.from_json(payload), use_container_width=True)
+                    return
+
+            df_filtered_date = df_filtered[df_filtered['Date'].dt.date == selected_date]
+
+            fig = make_subplots(rows=1, cols=2, shared_yaxes=True, column_widths=[0.75, 0.25], horizontal_spacing=0.01)
+
+            # Create scatter plot
+            scatter_fig = px.scatter(df_filtered_date, x="Value", y="Description", color="Description", size_max=20, text="Text")
+            scatter_fig.update_traces(marker=dict(size=20))
+            scatter_fig.update_traces(marker=dict(line=dict(width=1, color='black')), textposition='middle right', textfont=dict(family='Arial', size=15, color='black', weight='bold'))
+            scatter_fig.update_layout(showlegend=False, xaxis_title="Value of " + selected_metric_type)
+
+            # Map colors from scatter plot to bar plot
+            color_map = {desc: trace.marker.color for desc, trace in zip(df_filtered_date['Description'], scatter_fig.data)}
+
+            # Create bar plot
+            bar_fig = px.bar(df_filtered_date, x="Weighted Average", y="Description", orientation='h', text_auto='.2f')
+            bar_fig.update_traces(textposition='outside', textfont=dict(size=15, family='Arial', color='black', weight='bold'))
+            bar_fig.update_traces(marker=dict(line=dict(width=2, color='black')))
+            bar_fig.update_traces(marker_color=[color_map[desc] for desc in df_filtered_date['Description']])
+            bar_fig.update_layout(showlegend=False, xaxis_title="Weighted Average", yaxis=dict(showticklabels=False))
+
+            # Update the y-axis tick labels to be bold
+            fig.update_yaxes(tickfont=dict(size=15, family='Arial', color='black', weight='bold'), row=1, col=1)
+
+            for trace in scatter_fig.data:
+                fig.add_trace(trace, row=1, col=1)
+
+            for trace in bar_fig.data:
+                fig.add_trace(trace, row=1, col=2)
+
+            # Create a reversed list of categories (descriptions)
+            categories_reversed = df_filtered_date['Description'].tolist()[::-1]
+
+            # Reverse the order of the y-axis for both the scatter plot and the bar plot
+            fig.update_yaxes(categoryorder='array', categoryarray=categories_reversed, row=1, col=1)
+            fig.update_yaxes(categoryorder='array', categoryarray=categories_reversed, row=1, col=2)
+
+            # Update the layout for the combined figure
+            fig.update_xaxes(row=1, col=1, range=[overall_min_value, overall_max_value * 1.05], fixedrange=True, showline=True, linewidth=1.5, linecolor='grey', mirror=True, showgrid=True, gridcolor='lightgrey')
+            fig.update_yaxes(row=1, col=1, tickfont=dict(size=15),fixedrange=True, showline=True, linewidth=1.5, linecolor='grey', mirror=True, showgrid=True, gridcolor='lightgrey')
+
+            if selected_metric_type == "Inflation":
+                fig.update_xaxes(row=1, col=2, range=[min_weighted_avg*3, max_weighted_avg * 1.4],fixedrange=True, showline=True, linewidth=1.5, linecolor='grey', mirror=True, showgrid=True, gridcolor='lightgrey')
+            else:
+                fig.update_xaxes(row=1, col=2, range=[0, max_weighted_avg * 1.4],fixedrange=True, showline=True, linewidth=1.5, linecolor='grey', mirror=True, showgrid=True, gridcolor='lightgrey')
+
+            fig.update_yaxes(row=1, col=2, fixedrange=True, showline=True, linewidth=1.5, linecolor='grey', mirror=True, showgrid=True, gridcolor='lightgrey')
         
-        fig.update_layout(height=700, width=1200, margin=dict(l=5, r=10, t=0, b=0, pad=0), showlegend=False, yaxis=dict(automargin=True))
-
-        # Update the layout for the combined figure with x-axis labels
-        fig.update_xaxes(title_text="CPI " + selected_metric_type, row=1, col=1, title_font=dict(size=15, family='Arial', color='black', weight='bold'))
-        fig.update_xaxes(title_text="Weight Adjusted Values", row=1, col=2, title_font=dict(size=15, family='Arial', color='black', weight='bold'))
+            fig.update_layout(height=700, width=1200, margin=dict(l=5, r=10, t=0, b=0, pad=0), showlegend=False, yaxis=dict(automargin=True))
 
-        # Display the plot in the placeholder
-        plot_placeholder.plotly_chart(fig, use_container_width=True)
+            # Update the layout for the combined figure with x-axis labels
+            fig.update_xaxes(title_text="CPI " + selected_metric_type, row=1, col=1, title_font=dict(size=15, family='Arial', color='black', weight='bold'))
+            fig.update_xaxes(title_text="Weight Adjusted Values", row=1, col=2, title_font=dict(size=15, family='Arial', color='black', weight='bold'))
 
-    def update_title(selected_date):
-        # Create the styled title
-        styled_category_type = f"<span style='color:red; font-weight:bold;'>{selected_category_type}</span>"
-        styled_sector_type = f"<span style='color:blue; font-weight:bold;'>{selected_sector_type}</span>"
-        styled_metric_type = f"<span style='color:brown; font-weight:bold;'>{selected_metric_type}</span>"
-        styled_month = f"<span style='color:green; font-weight:bold;'>{selected_date.strftime('%b %Y')}</span>"
-        title = f"Consumer Price {styled_category_type} {styled_sector_type} {styled_metric_type} Data For Month - {styled_month}"
+            if share_figures:
+                put_figure(SHARED_CACHE_DIR, freshness_token, cache_key, fig.to_json())
 
-        # Display the date with month on top along with the title
-        title_placeholder.markdown(f"<h1 style='font-size:30px; margin-top: -20px;'>{title}</h1>", unsafe_allow_html=True)
+            # Display the plot in the placeholder
+            plot_placeholder.plotly_chart(fig, use_container_width=True)
 
-    # Initialize title and slider
-    if 'current_index' not in st.session_state:
-        st.session_state.current_index = 0
+        def update_title(selected_date):
+            # Create the styled title
+            styled_category_type = f"<span style='color:red; font-weight:bold;'>{selected_category_type}</span>"
+            styled_sector_type = f"<span style='color:blue; font-weight:bold;'>{selected_sector_type}</span>"
+            styled_metric_type = f"<span style='color:brown; font-weight:bold;'>{selected_metric_type}</span>"
+            styled_month = f"<span style='color:green; font-weight:bold;'>{selected_date.strftime('%b %Y')}</span>"
+            title = f"Consumer Price {styled_category_type} {styled_sector_type} {styled_metric_type} Data For Month - {styled_month}"
 
-    if 'is_playing' not in st.session_state:
-        st.session_state.is_playing = False
+            # Display the date with month on top along with the title
+            title_placeholder.markdown(f"<h1 style='font-size:30px; margin-top: -20px;'>{title}</h1>", unsafe_allow_html=True)
 
-    # Validate the current index
-    if st.session_state.current_index >= len(unique_dates):
-        st.session_state.current_index = 0
+        # Initialize title and slider
+        if 'current_index' not in st.session_state:
+            st.session_state.current_index = 0
 
-    slider = slider_placeholder.slider("Slider for Selecting Date Index", min_value=0, max_value=len(unique_dates) - 1, value=st.session_state.current_index, key="date_slider")
-    update_title(unique_dates[slider])
+        if 'is_playing' not in st.session_state:
+            st.session_state.is_playing = False
 
-    if play_button:
-        st.session_state.is_playing = True
-        if st.session_state.current_index == len(unique_dates) - 1:
+        # Validate the current index
+        if st.session_state.current_index >= len(unique_dates):
             st.session_state.current_index = 0
 
-    if pause_button:
-        st.session_state.is_playing = False
+        slider = slider_placeholder.slider("Slider for Selecting Date Index", min_value=0, max_value=len(unique_dates) - 1, value=st.session_state.current_index, key="date_slider")
+        update_title(unique_dates[slider])
 
+        if play_button:
+            st.session_state.is_playing = True
+            if st.session_state.current_index == len(unique_dates) - 1:
+                st.session_state.current_index = 0
 
-    #New Code 10th Aug 2024
-    # Placeholder for the Next and Previous buttons at the bottom of the page
-    button_placeholder = st.empty()
+        if pause_button:
+            st.session_state.is_playing = False
 
 
-    if st.session_state.is_playing:
-        for i in range(st.session_state.current_index, len(unique_dates)):
-            if not st.session_state.is_playing:
-                break
-            selected_date = unique_dates[i]
+        #New Code 10th Aug 2024
+        # Placeholder for the Next and Previous buttons at the bottom of the page
+        button_placeholder = st.empty()
+
+
+        if st.session_state.is_playing:
+            for i in range(st.session_state.current_index, len(unique_dates)):
+                if not st.session_state.is_playing:
+                    break
+                selected_date = unique_dates[i]
+                update_plot(selected_date)
+                update_title(selected_date)
+                st.session_state.current_index = i
+                slider_placeholder.slider("Slider for Selecting Date Index", min_value=0, max_value=len(unique_dates) - 1, value=i, key=f"date_slider1_{i}")
+                time.sleep(0.15)  # Adjust the sleep time to control the animation speed
+        else:
+            selected_date = unique_dates[slider]
             update_plot(selected_date)
             update_title(selected_date)
-            st.session_state.current_index = i
-            slider_placeholder.slider("Slider for Selecting Date Index", min_value=0, max_value=len(unique_dates) - 1, value=i, key=f"date_slider1_{i}")
-            time.sleep(0.15)  # Adjust the sleep time to control the animation speed
-    else:
-        selected_date = unique_dates[slider]
-        update_plot(selected_date)
-        update_title(selected_date)
-        st.session_state.current_index = slider
+            st.session_state.current_index = slider
 
     
-    #New Code 10th Aug 2024 (all below)
-    # Display the Next and Previous buttons
-    col1, col2 = button_placeholder.columns(2)
-
-    with col1:
-        prev_button = st.button("Previous")
-    with col2:
-        next_button = st.button("Next")
-
-    # Handle the button clicks
-    if prev_button and st.session_state.current_index > 0:
-        st.session_state.current_index -= 1
-        selected_date = unique_dates[st.session_state.current_index]
-        update_plot(selected_date)
-        update_title(selected_date)
-        st.session_state.is_playing = False  # Pause the animation when navigating manually
-
-    if next_button and st.session_state.current_index < len(unique_dates) - 1:
-        st.session_state.current_index += 1
-        selected_date = unique_dates[st.session_state.current_index]
-        update_plot(selected_date)
-        update_title(selected_date)
-        st.session_state.is_playing = False  # Pause the animation when navigating manually
-
-    # Animation loop controlled by the play button remains unchanged...
-    if st.session_state.is_playing:
-        for i in range(st.session_state.current_index, len(unique_dates)):
-            if not st.session_state.is_playing:
-                break
-            selected_date = unique_dates[i]
+        #New Code 10th Aug 2024 (all below)
+        # Display the Next and Previous buttons
+        col1, col2 = button_placeholder.columns(2)
+
+        with col1:
+            prev_button = st.button("Previous")
+        with col2:
+            next_button = st.button("Next")
+
+        # Handle the button clicks
+        if prev_button and st.session_state.current_index > 0:
+            st.session_state.current_index -= 1
+            selected_date = unique_dates[st.session_state.current_index]
             update_plot(selected_date)
             update_title(selected_date)
-            st.session_state.current_index = i
-            slider_placeholder.slider("Slider for Selecting Date Index", min_value=0, max_value=len(unique_dates) - 1, value=i, key=f"date_slider2_{i}")
-            time.sleep(0.3)  # Adjust sleep time to control the animation speed
+            st.session_state.is_playing = False  # Pause the animation when navigating manually
 
+        if next_button and st.session_state.current_index < len(unique_dates) - 1:
+            st.session_state.current_index += 1
+            selected_date = unique_dates[st.session_state.current_index]
+            update_plot(selected_date)
+            update_title(selected_date)
+            st.session_state.is_playing = False  # Pause the animation when navigating manually
+
+        # Animation loop controlled by the play button remains unchanged...
+        if st.session_state.is_playing:
+            for i in range(st.session_state.current_index, len(unique_dates)):
+                if not st.session_state.is_playing:
+                    break
+                selected_date = unique_dates[i]
+                update_plot(selected_date)
+                update_title(selected_date)
+                st.session_state.current_index = i
+                slider_placeholder.slider("Slider for Selecting Date Index", min_value=0, max_value=len(unique_dates) - 1, value=i, key=f"date_slider2_{i}")
+                time.sleep(0.3)  # Adjust sleep time to control the animation speed
+
+# Always stop the profiler, also when the rerun is cut short by a widget click
+# (RerunException), st.stop() or an error, since tracemalloc is process-wide
+finally:
+    if rerun_profiler is not None:
+        st.session_state.last_profile = rerun_profiler.stop()
+
+# Show where the time and memory went in the last profiled rerun
+if is_admin:
+    if st.sidebar.button("Profile next rerun"):
+        if profiling_busy():
+            st.sidebar.warning("Another rerun is being profiled in this process, try again later")
+        else:
+            st.session_state.profile_armed = True
+            st.sidebar.caption("The next rerun will be profiled")
+
+    profile_summary = st.session_state.pop("last_profile", None)
+    if profile_summary is not None:
+        with st.expander(f"Rerun profile: {profile_summary['duration']:.2f}s, peak {profile_summary['peak_mib']:.1f} MiB traced", expanded=True):
+            st.caption(f"Saved to {profile_summary['profile_path']} and {profile_summary['snapshot_path']}")
+            st.code(profile_summary['stats'])
+            st.dataframe(profile_summary['allocations'], hide_index=True)
@@ -0,0 +1,116 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pandas as pd
+
+from data_sources import TabularDirSource
+
+# Local stand-in for the CPI release API, used to exercise HttpJsonSource
+# without hitting the real endpoint. Serves the release JSON built from a
+# directory of CSV/Parquet files and honours If-None-Match / If-Modified-Since.
+#
+#   python mock_cpi_server.py --data-dir data --port 8765
+#
+# and set data_source = "http", cpi_api_url = "http://127.0.0.1:8765/cpi" in secrets.
+
+
+# Convert the long-format frame back into the release payload
+def frame_to_release(df):
+    # Weight stays out of the pivot index so descriptions without a weight are kept
+    wide = df.pivot_table(index=["Date", "Description"], columns="ValueType", values="Value", aggfunc="first", dropna=False).reset_index()
+    wide = wide.merge(df.groupby("Description", as_index=False)["Weight"].first(), on="Description", how="left")
+    split = wide["Description"].str.rsplit(" - ", n=1, expand=True)
+    dates = pd.to_datetime(wide["Date"])
+    records = pd.DataFrame({
+        "year": dates.dt.year,
+        "month": dates.dt.strftime("%B"),
+        "sector": split[1],
+        "description": split[0],
+        "weight": wide["Weight"],
+        "index": wide.get("Index"),
+        "inflation": wide.get("Inflation"),
+    })
+    # NaN is not valid JSON, send null instead
+    records = records.astype(object).where(records.notna(), None)
+    return {"data": records.to_dict(orient="records")}
+
+
+class ReleaseState:
+    def __init__(self, source):
+        self.source = source
+        self.lock = threading.Lock()
+        self.token = None
+        self.body = b""
+        self.etag = None
+        self.last_modified = None
+
+    # Rebuild the body only when the files on disk change
+    def current(self):
+        with self.lock:
+            token = self.source.freshness()
+            if token != self.token:
+                self.body = json.dumps(frame_to_release(self.source.fetch())).encode()
+                self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+                self.last_modified = formatdate(usegmt=True)
+                self.token = token
+            return self.body, self.etag, self.last_modified
+
+
+def make_handler(state, path):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path.split("?")[0] != path:
+                self.send_error(404)
+                return
+            body, etag, last_modified = state.current()
+            if self.headers.get("If-None-Match") == etag or (
+                self.headers.get("If-None-Match") is None and self.headers.get("If-Modified-Since") == last_modified
+            ):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+# Start the server in a background thread (handy for tests), returns the server
+def start_server(data_dir, host="127.0.0.1", port=0, path="/cpi"):
+    state = ReleaseState(TabularDirSource(data_dir))
+    server = ThreadingHTTPServer((host, port), make_handler(state, path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock CPI release API")
+    parser.add_argument("--data-dir", default=os.environ.get("CPI_DATA_DIR", "data"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/cpi")
+    args = parser.parse_args()
+
+    state = ReleaseState(TabularDirSource(args.data_dir))
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state, args.path))
+    print(f"Serving CPI release from {args.data_dir} on http://{args.host}:{args.port}{args.path}")
+    server.serve_forever()
@@ -0,0 +1,63 @@
+import plotly.express as px
+import streamlit as st
+
+from cpi_data import current_token, base_data
+from comovement import to_matrix, correlation_matrix, rolling_correlation, lagged_correlation
+
+st.set_page_config(
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Hide Streamlit style and buttons
+hide_st_style = '''
+    <style>
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
+    </style>
+'''
+st.markdown(hide_st_style, unsafe_allow_html=True)
+
+# Correlation, rolling and lagged correlation, computed once per sector, metric and settings
+@st.cache_data
+def load_comovement(freshness_token, sector, metric, window, max_lag):
+    wide = to_matrix(base_data(freshness_token), sector, metric)
+    target = f"A) General Index - {sector}"
+    return correlation_matrix(wide), rolling_correlation(wide, target, window), lagged_correlation(wide, target, max_lag)
+
+freshness_token = current_token()
+
+selected_metric_type = st.sidebar.selectbox("Select Metric Type", ["Inflation", "Index"])
+selected_sector_type = st.sidebar.selectbox("Select Sector Type", ["Rural", "Urban", "Combined"], index=2)
+window = st.sidebar.slider("Rolling Window (months)", min_value=6, max_value=60, value=24)
+max_lag = st.sidebar.slider("Max Lag (months)", min_value=1, max_value=24, value=12)
+
+corr, rolling, lagged = load_comovement(freshness_token, selected_sector_type, selected_metric_type, window, max_lag)
+
+st.markdown(f"<h1 style='font-size:30px; margin-top: -20px;'>Co-movement of CPI Sub-groups - <span style='color:blue;'>{selected_sector_type}</span> <span style='color:brown;'>{selected_metric_type}</span></h1>", unsafe_allow_html=True)
+
+heatmap_args = dict(color_continuous_scale="RdBu_r", zmin=-1, zmax=1, aspect="auto")
+
+st.subheader("Pairwise Correlation")
+fig = px.imshow(corr.round(2), text_auto=True, **heatmap_args)
+fig.update_layout(height=900, margin=dict(l=5, r=10, t=10, b=0))
+st.plotly_chart(fig, use_container_width=True)
+
+st.subheader("Lead / Lag Correlation with General Index")
+st.caption("Positive lag: the sub-group leads the General Index by that many months")
+fig = px.imshow(lagged.round(2), **heatmap_args)
+fig.update_layout(height=700, margin=dict(l=5, r=10, t=10, b=0))
+st.plotly_chart(fig, use_container_width=True)
+
+# Lag with the strongest correlation for each sub-group (the General Index
+# itself always peaks at lag 0)
+target = f"A) General Index - {selected_sector_type}"
+best_lag = lagged.drop(index=target, errors='ignore').abs().dropna(how='all').idxmax(axis=1)
+if not best_lag.empty:
+    st.dataframe(best_lag.rename("Strongest Lag").to_frame(), use_container_width=True)
+
+st.subheader(f"Rolling {window}-Month Correlation with General Index")
+fig = px.imshow(rolling.T.round(2), **heatmap_args)
+fig.update_layout(height=700, margin=dict(l=5, r=10, t=10, b=0))
+st.plotly_chart(fig, use_container_width=True)
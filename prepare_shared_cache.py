@@ -0,0 +1,52 @@
+import argparse
+import os
+import tomllib
+import numpy as np
+import pandas as pd
+
+from data_sources import source_from_settings
+from derived_series import derive_sector
+from shared_cache import read_manifest, write_frame, publish, prune
+
+# One-time prepare step for the multi-replica deployment mode. Loads the data
+# through the configured source, precomputes the derived aggregates and writes
+# both to the shared directory. Replicas started with shared_cache_dir set
+# (st.secrets or CPI_SHARED_CACHE_DIR) then only map these files.
+#
+#   python prepare_shared_cache.py --out /srv/cpi-cache
+
+
+def prepare(settings, root):
+    source = source_from_settings(settings)
+    token = source.freshness()
+    os.makedirs(root, exist_ok=True)
+    try:
+        previous = read_manifest(root)["token"]
+    except FileNotFoundError:
+        previous = None
+    if previous == token:
+        return token, False
+
+    df = source.fetch()
+    df["Date"] = pd.to_datetime(df["Date"])
+    df["Value"] = pd.to_numeric(df["Value"].replace("-", np.nan), errors="coerce")
+    write_frame(root, token, "data", df)
+    for sector in ["Rural", "Urban", "Combined"]:
+        write_frame(root, token, f"derived_{sector}", derive_sector(df, sector))
+    publish(root, token)
+    # Keep the previous version for replicas that have not switched over yet
+    prune(root, {token, previous})
+    return token, True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prepare the shared CPI cache for Streamlit replicas")
+    parser.add_argument("--out", default=os.environ.get("CPI_SHARED_CACHE_DIR"), required="CPI_SHARED_CACHE_DIR" not in os.environ)
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml")
+    args = parser.parse_args()
+
+    with open(args.secrets, "rb") as f:
+        settings = tomllib.load(f)
+
+    token, written = prepare(settings, args.out)
+    print(f"{'Prepared' if written else 'Already up to date'}: {args.out} ({token})")
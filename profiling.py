@@ -0,0 +1,75 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import tracemalloc
+from datetime import datetime
+import pandas as pd
+
+# Profiles a single script rerun with cProfile and tracemalloc. start() is
+# called at the top of the script and stop() in a finally at the bottom; stop()
+# writes the .prof stats and the tracemalloc snapshot to out_dir and returns a
+# top-N summary. tracemalloc is process-wide, so only one rerun in the process
+# (across all sessions) can be profiled at a time.
+
+_active = threading.Lock()
+
+
+def profiling_busy():
+    return _active.locked() or tracemalloc.is_tracing()
+
+
+class RerunProfiler:
+    def __init__(self, out_dir, top_n=25):
+        self.out_dir = out_dir
+        self.top_n = top_n
+        self.profile = cProfile.Profile()
+        self.started_at = None
+
+    # Returns False when another profile (or any tracemalloc user) is running
+    def start(self):
+        if not _active.acquire(blocking=False):
+            return False
+        if tracemalloc.is_tracing():
+            _active.release()
+            return False
+        self.started_at = datetime.now()
+        tracemalloc.start(25)
+        self.profile.enable()
+        return True
+
+    def stop(self):
+        try:
+            self.profile.disable()
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            _active.release()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        stamp = self.started_at.strftime('%Y%m%d-%H%M%S')
+        profile_path = os.path.join(self.out_dir, f"rerun-{stamp}.prof")
+        snapshot_path = os.path.join(self.out_dir, f"rerun-{stamp}.tracemalloc")
+        self.profile.dump_stats(profile_path)
+        snapshot.dump(snapshot_path)
+
+        # Top functions by cumulative time
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats('cumulative').print_stats(self.top_n)
+
+        # Top allocation sites still alive at the end of the rerun
+        allocations = pd.DataFrame([
+            {"Location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "Size (KiB)": round(stat.size / 1024, 1), "Blocks": stat.count}
+            for stat in snapshot.statistics('lineno')[:self.top_n]
+        ])
+
+        return {
+            "duration": (datetime.now() - self.started_at).total_seconds(),
+            "peak_mib": peak / 1024 / 1024,
+            "profile_path": profile_path,
+            "snapshot_path": snapshot_path,
+            "stats": stream.getvalue(),
+            "allocations": allocations,
+        }
@@ -0,0 +1,101 @@
+import pandas as pd
+import numpy as np
+import re
+
+# What-if engine for custom basket weights. The A) tree of a sector is parsed
+# from the description codes ("A.1.3) Egg - Rural" -> "A.1.3"); every node index
+# is the weighted mean of its leaf indices, so all aggregates for all dates come
+# from one (dates x leaves) @ (leaves x nodes) product.
+
+
+def parse_code(description):
+    match = re.match(r"^([A-Z](?:\.\d+)*)\)", description)
+    return match.group(1) if match else None
+
+
+def _descends(leaf, node):
+    return leaf == node or leaf.startswith(node + ".")
+
+
+# Map code -> description for the A) tree of a sector, plus the leaf codes
+def build_hierarchy(descriptions, sector):
+    nodes = {}
+    for desc in descriptions:
+        code = parse_code(desc)
+        if code and code.startswith("A") and desc.endswith(f" - {sector}"):
+            nodes[code] = desc
+    leaves = [c for c in nodes if not any(other != c and _descends(other, c) for other in nodes)]
+    return nodes, leaves
+
+
+# Current basket weights of the leaves of a sector
+def leaf_weights(df, sector):
+    nodes, leaves = build_hierarchy(df['Description'].unique(), sector)
+    weights = df.groupby('Description', observed=True)['Weight'].first()
+    return pd.Series({nodes[c]: float(weights.get(nodes[c], np.nan)) for c in leaves}, name='Weight')
+
+
+# Leaves that can take part in a basket: a finite weight and at least one
+# index value in idx (Date x Description)
+def basket_leaves(nodes, leaves, weights, idx):
+    return [c for c in leaves if np.isfinite(weights.get(nodes[c], np.nan)) and nodes[c] in idx.columns and idx[nodes[c]].notna().any()]
+
+
+# (nodes x leaves) matrix of normalised leaf weights under every node
+def aggregation_matrix(nodes, leaves, weights):
+    codes = list(nodes)
+    w = np.array([weights[nodes[leaf]] for leaf in leaves], dtype=float)
+    mask = np.array([[_descends(leaf, node) for leaf in leaves] for node in codes], dtype=float)
+    node_weights = mask @ w
+    matrix = mask * w / np.where(node_weights == 0, np.nan, node_weights)[:, None]
+    return codes, np.nan_to_num(matrix), node_weights
+
+
+# Recompute index and inflation of every aggregate node in the sector for a new weight
+# set (leaf description -> weight). Leaves without a weight or without any
+# index value are left out of the basket and the rest is rescaled to sum to 100.
+# Returns the long rows (Date, Description, ValueType, Value, Weight) of the
+# aggregates, the contribution of each basket leaf to headline inflation in
+# percentage points (dates x leaves) and the rescaled basket leaf weights.
+def reweight(df, sector, weights):
+    weights = pd.Series(weights, dtype=float)
+
+    sub = df[df['ValueType'] == "Index"].copy()
+    sub['Date'] = pd.to_datetime(sub['Date'])
+    sub['Value'] = pd.to_numeric(sub['Value'].replace("-", np.nan), errors='coerce')
+    idx = sub.pivot_table(index='Date', columns='Description', values='Value', aggfunc='first', observed=True).sort_index()
+
+    nodes, leaves = build_hierarchy(df['Description'].unique(), sector)
+    leaves = basket_leaves(nodes, leaves, weights, idx)
+    leaf_desc = [nodes[c] for c in leaves]
+    weights = weights.reindex(leaf_desc)
+    weights = weights / weights.sum() * 100
+    codes, matrix, node_weights = aggregation_matrix(nodes, leaves, weights)
+    idx = idx.reindex(columns=leaf_desc)
+
+    values = idx.to_numpy(dtype=float)
+    missing = np.isnan(values)
+    agg = pd.DataFrame(np.where(missing, 0, values) @ matrix.T, index=idx.index, columns=[nodes[c] for c in codes])
+    # A node has no defined aggregate on a date where one of its own basket
+    # leaves is missing, nor at all when none of its leaves are in the basket
+    agg = agg.mask(missing.astype(float) @ (matrix.T > 0) > 0)
+    agg.loc[:, node_weights == 0] = np.nan
+    # Leaves keep their published values, only the aggregates are returned
+    agg = agg[[nodes[c] for c in codes if c not in leaves]]
+    infl = agg.pct_change(12, fill_method=None) * 100
+
+    node_weight = dict(zip([nodes[c] for c in codes], node_weights))
+    frames = []
+    for value_type, wide in (("Index", agg), ("Inflation", infl)):
+        long = wide.reset_index().melt(id_vars='Date', var_name='Description', value_name='Value')
+        long['ValueType'] = value_type
+        long['Weight'] = long['Description'].map(node_weight)
+        frames.append(long)
+    frame = pd.concat(frames, ignore_index=True)
+    frame['Value'] = frame['Value'].round(2)
+
+    # Leaf contributions: w_i * (I_i,t - I_i,t-12) / sum_j(w_j * I_j,t-12)
+    w = weights.to_numpy(dtype=float)
+    lagged = idx.shift(12).to_numpy(dtype=float)
+    contributions = pd.DataFrame((values - lagged) * w / (lagged @ w)[:, None] * 100, index=idx.index, columns=leaf_desc)
+    return frame, contributions, weights
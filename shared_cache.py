@@ -0,0 +1,112 @@
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Shared on-disk cache for running several Streamlit replicas off one prepared
+# copy of the data. prepare_shared_cache.py writes every frame column by column
+# as .npy files under <root>/<token>/ and flips <root>/manifest.json to point
+# at them; replicas only np.load(..., mmap_mode='r') those files, so numeric
+# columns live once in the OS page cache instead of once per process.
+#
+#   <root>/manifest.json                 {"token": ...}
+#   <root>/<token>/<name>.json           column names, kinds and string categories
+#   <root>/<token>/<name>.<column>.npy   column arrays
+#   <root>/<token>/figures/<key>.json    default-view figure payloads, written once by whoever renders first
+
+MANIFEST = "manifest.json"
+
+
+def _atomic_write(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def read_manifest(root):
+    with open(os.path.join(root, MANIFEST)) as f:
+        return json.load(f)
+
+
+def write_frame(root, token, name, df):
+    folder = os.path.join(root, token)
+    os.makedirs(folder, exist_ok=True)
+    meta = {"columns": []}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            kind, values = "datetime", series.to_numpy(dtype="datetime64[ns]").view("int64")
+        elif pd.api.types.is_numeric_dtype(series):
+            kind, values = "numeric", series.to_numpy()
+        else:
+            # Codes are stored in the dtype pandas itself uses for them, so
+            # they can be wrapped in a Categorical without a copy
+            cat = series.astype(str).where(series.notna()).astype("category")
+            kind, values = "string", cat.cat.codes.to_numpy()
+            meta.setdefault("categories", {})[col] = [str(c) for c in cat.cat.categories]
+        np.save(os.path.join(folder, f"{name}.{col}.npy"), values)
+        meta["columns"].append({"name": col, "kind": kind})
+    _atomic_write(os.path.join(folder, f"{name}.json"), json.dumps(meta).encode())
+
+
+# Point replicas at a fully written version
+def publish(root, token):
+    _atomic_write(os.path.join(root, MANIFEST), json.dumps({"token": token}).encode())
+
+
+# Delete every version directory (data and figures) not in keep. Replicas still
+# mapping a deleted version keep their pages until they unmap them.
+def prune(root, keep):
+    for entry in os.scandir(root):
+        if entry.is_dir() and not entry.name.startswith(".") and entry.name not in keep:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+# Build a frame that keeps each array as its own block. With copy on write
+# (pandas 3) concat does not consolidate same-dtype columns, so nothing is copied
+def _frame_from_columns(names, arrays):
+    return pd.concat([pd.Series(values, name=name, copy=False).to_frame() for name, values in zip(names, arrays)], axis=1)
+
+
+# Rebuild a frame on top of read-only memory maps. Every column stays a view of
+# its .npy file; string columns are Categoricals over the mapped codes.
+def read_frame(root, token, name):
+    folder = os.path.join(root, token)
+    with open(os.path.join(folder, f"{name}.json")) as f:
+        meta = json.load(f)
+    names, arrays = [], []
+    for col in meta["columns"]:
+        values = np.load(os.path.join(folder, f"{name}.{col['name']}.npy"), mmap_mode='r')
+        if col["kind"] == "datetime":
+            values = values.view("datetime64[ns]")
+        elif col["kind"] == "string":
+            dtype = pd.CategoricalDtype(meta["categories"][col["name"]])
+            values = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        names.append(col["name"])
+        arrays.append(values)
+    return _frame_from_columns(names, arrays)
+
+
+def figure_key(*parts):
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+# Figure payload (plotly JSON) read through a memory map, None if not rendered yet
+def get_figure(root, token, key):
+    path = os.path.join(root, token, "figures", f"{key}.json")
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return m[:].decode()
+    except FileNotFoundError:
+        return None
+
+
+def put_figure(root, token, key, payload):
+    folder = os.path.join(root, token, "figures")
+    os.makedirs(folder, exist_ok=True)
+    _atomic_write(os.path.join(folder, f"{key}.json"), payload.encode())
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from comovement import correlation_matrix, rolling_correlation, lagged_correlation
+
+TARGET = "A) General Index - Rural"
+
+
+# Correlated random walks with a few gaps, so pairwise-complete handling is exercised
+@pytest.fixture
+def wide():
+    rng = np.random.default_rng(1)
+    base = rng.normal(size=(96, 1))
+    values = base + rng.normal(scale=0.8, size=(96, 4))
+    frame = pd.DataFrame(values, index=pd.date_range("2015-01-01", periods=96, freq="MS"),
+                         columns=[TARGET, "A.1) Food and beverages - Rural", "A.4) Housing - Rural", "A.5) Fuel and light - Rural"])
+    frame.iloc[10:14, 1] = np.nan
+    frame.iloc[40, 0] = np.nan
+    frame.iloc[60:66, 2] = np.nan
+    return frame
+
+
+def test_correlation_matrix_matches_pandas(wide):
+    pd.testing.assert_frame_equal(correlation_matrix(wide), wide.corr(min_periods=12))
+
+
+def test_rolling_correlation_matches_pandas(wide):
+    expected = wide.rolling(24, min_periods=12).corr(wide[TARGET])
+    pd.testing.assert_frame_equal(rolling_correlation(wide, TARGET, window=24), expected, atol=1e-10)
+
+
+def test_lagged_correlation_matches_shifted_corr(wide):
+    lagged = lagged_correlation(wide, TARGET, max_lag=6)
+    for lag in lagged.columns:
+        expected = [wide[col].shift(lag).corr(wide[TARGET], min_periods=12) for col in wide.columns]
+        np.testing.assert_allclose(lagged[lag].to_numpy(), expected, atol=1e-10)
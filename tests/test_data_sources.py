@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_sources import HttpJsonSource
+from mock_cpi_server import start_server
+
+
+@pytest.fixture
+def cpi_dir(tmp_path):
+    rows = []
+    for date in pd.date_range("2023-01-01", periods=3, freq="MS"):
+        for desc, weight in [("A) General Index - Rural", 100.0), ("A.1) Food and beverages - Rural", 54.18), ("A.4) Housing - Rural", np.nan)]:
+            rows.append((date, desc, "Index", 180.5, weight))
+            rows.append((date, desc, "Inflation", 5.1, weight))
+    df = pd.DataFrame(rows, columns=["Date", "Description", "ValueType", "Value", "Weight"])
+    df.to_csv(tmp_path / "cpi.csv", index=False)
+    return tmp_path, df
+
+
+@pytest.fixture
+def server(cpi_dir):
+    server = start_server(str(cpi_dir[0]))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_round_trip_through_mock_server(cpi_dir, server):
+    source = HttpJsonSource(f"http://127.0.0.1:{server.server_address[1]}/cpi", check_interval=0)
+
+    token = source.freshness()
+    assert source.last_status == 200
+    assert source.freshness() == token
+    assert source.last_status == 304
+
+    df = source.fetch()
+    expected = cpi_dir[1]
+    assert sorted(df['Description'].unique()) == sorted(expected['Description'].unique())
+    assert len(df) == len(expected)
+    assert df.loc[df['Description'] == "A.4) Housing - Rural", 'Weight'].isna().all()
+
+
+def test_keeps_last_token_when_upstream_fails(server):
+    source = HttpJsonSource(f"http://127.0.0.1:{server.server_address[1]}/cpi", check_interval=0)
+    token = source.freshness()
+
+    server.shutdown()
+    server.server_close()
+    source.session.close()
+
+    assert source.freshness() == token
+    assert not source.fetch().empty
+
+
+def test_does_not_wait_for_a_running_refresh(server):
+    source = HttpJsonSource(f"http://127.0.0.1:{server.server_address[1]}/cpi", check_interval=0)
+    token = source.freshness()
+
+    # Another session is in the middle of a refresh
+    with source.lock:
+        assert source.freshness() == token
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from reweighting import leaf_weights, reweight
+
+LEAVES = {
+    "A.1.1) Cereals - Rural": 30.0,
+    "A.1.2) Meat - Rural": 20.0,
+    "A.2) Pan, tobacco and intoxicants - Rural": 10.0,
+    "A.3.1) Clothing - Rural": 25.0,
+    "A.3.2) Footwear - Rural": 15.0,
+}
+PARENTS = {
+    "A) General Index - Rural": list(LEAVES),
+    "A.1) Food and beverages - Rural": ["A.1.1) Cereals - Rural", "A.1.2) Meat - Rural"],
+    "A.3) Clothing and footwear - Rural": ["A.3.1) Clothing - Rural", "A.3.2) Footwear - Rural"],
+}
+
+
+# A published release: every parent index is the weighted mean of its leaves
+def published(dates=36):
+    rng = np.random.default_rng(0)
+    index = pd.DataFrame({desc: 100 * np.cumprod(1 + rng.normal(0.005, 0.01, dates)) for desc in LEAVES},
+                         index=pd.date_range("2015-01-01", periods=dates, freq="MS"))
+    weights = dict(LEAVES)
+    for parent, children in PARENTS.items():
+        w = np.array([LEAVES[c] for c in children])
+        index[parent] = index[children].to_numpy() @ w / w.sum()
+        weights[parent] = w.sum()
+
+    rows = []
+    for value_type, wide in (("Index", index), ("Inflation", index.pct_change(12, fill_method=None) * 100)):
+        long = wide.rename_axis('Date').reset_index().melt(id_vars='Date', var_name='Description', value_name='Value')
+        long['ValueType'] = value_type
+        rows.append(long)
+    df = pd.concat(rows, ignore_index=True)
+    df['Weight'] = df['Description'].map(weights)
+    return df[['Date', 'Description', 'ValueType', 'Value', 'Weight']]
+
+
+def wide(frame, value_type):
+    return frame[frame['ValueType'] == value_type].pivot(index='Date', columns='Description', values='Value')
+
+
+def test_published_weights_reproduce_published_aggregates():
+    df = published()
+    frame, contributions, weights = reweight(df, "Rural", leaf_weights(df, "Rural"))
+
+    assert sorted(frame['Description'].unique()) == sorted(PARENTS)
+    for value_type in ("Index", "Inflation"):
+        expected = wide(df, value_type)[sorted(PARENTS)]
+        pd.testing.assert_frame_equal(wide(frame, value_type)[sorted(PARENTS)], expected.round(2), check_names=False, atol=0.01)
+
+    node_weights = frame.groupby('Description')['Weight'].first()
+    assert node_weights["A) General Index - Rural"] == pytest.approx(100)
+    assert node_weights["A.1) Food and beverages - Rural"] == pytest.approx(50)
+    # Leaf contributions add up to headline inflation
+    headline = wide(df, "Inflation")["A) General Index - Rural"]
+    pd.testing.assert_series_equal(contributions.sum(axis=1, min_count=1), headline, check_names=False)
+
+
+def test_missing_leaf_value_only_blanks_its_ancestors():
+    df = published()
+    gap = (df['Description'] == "A.3.2) Footwear - Rural") & (df['ValueType'] == "Index") & (df['Date'] == "2016-06-01")
+    df.loc[gap, 'Value'] = np.nan
+
+    index = wide(reweight(df, "Rural", leaf_weights(df, "Rural"))[0], "Index")
+    assert np.isnan(index.loc["2016-06-01", "A.3) Clothing and footwear - Rural"])
+    assert np.isnan(index.loc["2016-06-01", "A) General Index - Rural"])
+    assert np.isfinite(index.loc["2016-06-01", "A.1) Food and beverages - Rural"])
+    assert index.drop(pd.Timestamp("2016-06-01")).notna().all().all()
+
+
+def test_leaf_without_weight_is_left_out_of_the_basket():
+    df = published()
+    weights = leaf_weights(df, "Rural")
+    weights["A.2) Pan, tobacco and intoxicants - Rural"] = np.nan
+
+    frame, contributions, basket = reweight(df, "Rural", weights)
+
+    assert "A.2) Pan, tobacco and intoxicants - Rural" not in basket.index
+    assert basket.sum() == pytest.approx(100)
+    assert basket["A.1.1) Cereals - Rural"] == pytest.approx(30 / 90 * 100)
+    leaves = wide(df, "Index")[[d for d in LEAVES if not d.startswith("A.2)")]]
+    expected = leaves.to_numpy() @ basket[leaves.columns].to_numpy() / 100
+    np.testing.assert_allclose(wide(frame, "Index")["A) General Index - Rural"], expected, atol=0.01)
@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from shared_cache import write_frame, read_frame, publish, read_manifest
+
+
+# Each np.load maps the file at a new address, so follow the view chain back
+# to the np.memmap and compare the file it maps instead of the addresses
+def _mapped_file(arr):
+    while isinstance(arr, np.ndarray):
+        if isinstance(arr, np.memmap) and arr.filename:
+            return os.path.realpath(arr.filename)
+        arr = arr.base
+    return None
+
+
+def _npy(root, name, column):
+    return os.path.realpath(os.path.join(root, "tok", f"{name}.{column}.npy"))
+
+
+def test_read_frame_stays_memory_mapped(tmp_path):
+    root = str(tmp_path)
+    df = pd.DataFrame({
+        "Date": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01"]).astype("datetime64[ns]"),
+        "Description": ["A) General Index - Rural", np.nan, "A) General Index - Rural"],
+        "ValueType": ["Index", "Index", "Inflation"],
+        "Value": [190.3, np.nan, 5.1],
+        "Weight": [100.0, 54.18, 100.0],
+    })
+    write_frame(root, "tok", "data", df)
+    publish(root, "tok")
+
+    frame = read_frame(root, read_manifest(root)["token"], "data")
+
+    pd.testing.assert_frame_equal(frame.astype({"Description": object, "ValueType": object}), df.astype({"Description": object, "ValueType": object}))
+    assert _mapped_file(frame["Value"].to_numpy()) == _npy(root, "data", "Value")
+    assert _mapped_file(frame["Weight"].to_numpy()) == _npy(root, "data", "Weight")
+    assert _mapped_file(frame["Date"].array._ndarray) == _npy(root, "data", "Date")
+    assert _mapped_file(frame["Description"].array.codes) == _npy(root, "data", "Description")
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from validation import validate
+
+WEIGHTS = {
+    "A) General Index - Rural": 100.0,
+    "A.1) Food and beverages - Rural": 60.0,
+    "A.2) Housing - Rural": 40.0,
+}
+
+
+# A clean release: leaf weights add up to 100 and the headline is their weighted mean
+@pytest.fixture
+def release():
+    dates = pd.date_range("2020-01-01", periods=24, freq="MS")
+    food = 100 + np.arange(24) * 0.5
+    housing = 100 + np.arange(24) * 0.25
+    index = pd.DataFrame({
+        "A.1) Food and beverages - Rural": food,
+        "A.2) Housing - Rural": housing,
+        "A) General Index - Rural": (food * 60 + housing * 40) / 100,
+    }, index=dates)
+
+    rows = []
+    for value_type, wide in (("Index", index), ("Inflation", index.pct_change(12) * 100)):
+        long = wide.rename_axis('Date').reset_index().melt(id_vars='Date', var_name='Description', value_name='Value')
+        long['ValueType'] = value_type
+        rows.append(long)
+    df = pd.concat(rows, ignore_index=True)
+    df['Weight'] = df['Description'].map(WEIGHTS)
+    return df[['Date', 'Description', 'ValueType', 'Value', 'Weight']]
+
+
+def test_clean_release_has_no_issues(release):
+    assert all(rows.empty for rows in validate(release).values())
+
+
+def test_dropped_month_is_reported(release):
+    report = validate(release[release['Date'] != "2021-03-01"])
+
+    missing = report["Missing values"]
+    assert set(missing['Date']) == {pd.Timestamp("2021-03-01")}
+    assert len(missing) == 2 * len(WEIGHTS)
+
+
+def test_duplicate_key_is_reported(release):
+    report = validate(pd.concat([release, release.iloc[[5]]], ignore_index=True))
+
+    assert len(report["Duplicate rows"]) == 2
+    assert report["Duplicate rows"]['Description'].unique().tolist() == [release.iloc[5]['Description']]
+
+
+def test_weight_sum_off_100_is_reported(release):
+    release.loc[release['Description'] == "A.2) Housing - Rural", 'Weight'] = 35.0
+
+    sums = validate(release)["Weight sums"]
+    assert sums['Sector'].tolist() == ["Rural"]
+    assert sums['Weight Sum'].tolist() == [95.0]
+
+
+def test_inconsistent_parent_is_reported(release):
+    off = (release['Description'] == "A) General Index - Rural") & (release['ValueType'] == "Index") & (release['Date'] == "2020-06-01")
+    release.loc[off, 'Value'] *= 1.05
+
+    parents = validate(release)["Parent consistency"]
+    assert parents[['Date', 'Description', 'Status']].values.tolist() == [[pd.Timestamp("2020-06-01"), "A) General Index - Rural", "inconsistent"]]
+    assert parents['Gap %'].iloc[0] == pytest.approx(5, abs=0.01)
@@ -0,0 +1,109 @@
+import pandas as pd
+import numpy as np
+
+from reweighting import build_hierarchy, basket_leaves, aggregation_matrix
+
+# Data-quality checks run once per data version at ingest. Every check works
+# on whole columns or on the Date x Description grid and returns a frame of the
+# offending rows, so nothing is dropped silently further down.
+
+KEYS = ['Date', 'Description', 'ValueType']
+SECTORS = ["Rural", "Urban", "Combined"]
+
+
+def _clean(df):
+    df = df.copy()
+    df['Date'] = pd.to_datetime(df['Date'])
+    df['Value'] = pd.to_numeric(df['Value'].replace("-", np.nan), errors='coerce')
+    return df
+
+
+# Rows sharing the same (Date, Description, ValueType)
+def check_duplicates(df):
+    return df[df.duplicated(KEYS, keep=False)].sort_values(KEYS)[KEYS + ['Value']]
+
+
+# Cells of the Date x Description grid (per ValueType) that are absent or empty,
+# over every month between the first and last date so dropped months show up
+def check_completeness(df):
+    grid = df.pivot_table(index='Date', columns=['ValueType', 'Description'], values='Value', aggfunc='first', dropna=False, observed=True)
+    months = pd.date_range(df['Date'].min(), df['Date'].max(), freq='MS', name='Date')
+    full = pd.MultiIndex.from_product([df['ValueType'].unique(), df['Description'].unique()], names=['ValueType', 'Description'])
+    grid = grid.reindex(index=months, columns=full)
+    missing = grid.isna().stack(['ValueType', 'Description'], future_stack=True)
+    missing = missing[missing].reset_index()[['Date', 'ValueType', 'Description']]
+    # The first 12 months have no year on year inflation by construction
+    first_inflation = df['Date'].min() + pd.DateOffset(months=12)
+    return missing[~((missing['ValueType'] == "Inflation") & (missing['Date'] < first_inflation))]
+
+
+# Descriptions without a weight (shown as "(NaN)" in the chart labels)
+def check_missing_weights(df):
+    weights = df.groupby('Description', observed=True)['Weight'].first()
+    return weights[weights.isna()].rename_axis('Description').reset_index()[['Description']]
+
+
+# Leaf weights of each sector should add up to 100
+def check_weight_sums(df, tol=0.05):
+    rows = []
+    weights = df.groupby('Description', observed=True)['Weight'].first()
+    for sector in SECTORS:
+        nodes, leaves = build_hierarchy(weights.index, sector)
+        if not leaves:
+            continue
+        total = weights.reindex([nodes[c] for c in leaves]).sum()
+        rows.append({"Sector": sector, "Leaves": len(leaves), "Weight Sum": round(total, 2), "OK": abs(total - 100) <= tol})
+    report = pd.DataFrame(rows, columns=["Sector", "Leaves", "Weight Sum", "OK"])
+    return report[~report['OK']]
+
+
+# Published parent indices against the weighted mean of their leaves, flagged
+# when they differ by more than tol percent. Leaves without a weight or without
+# values are left out (they show up under "Missing weights" / "Missing values");
+# a parent with none of its leaves left is reported as not checked.
+def check_parent_consistency(df, tol=1.0):
+    frames = []
+    weights = df.groupby('Description', observed=True)['Weight'].first()
+    index = df[df['ValueType'] == "Index"].pivot_table(index='Date', columns='Description', values='Value', aggfunc='first', observed=True)
+    for sector in SECTORS:
+        nodes, all_leaves = build_hierarchy(weights.index, sector)
+        leaves = basket_leaves(nodes, all_leaves, weights, index)
+        parents = [c for c in nodes if c not in all_leaves]
+        if not parents:
+            continue
+        if not leaves:
+            frames.append(pd.DataFrame({'Date': pd.NaT, 'Description': [nodes[c] for c in parents], 'Gap %': np.nan, 'Status': "not checked"}))
+            continue
+        codes, matrix, node_weights = aggregation_matrix(nodes, leaves, weights)
+        rows = [codes.index(c) for c in parents]
+        unchecked = [nodes[codes[i]] for i in rows if node_weights[i] == 0]
+        rows = [i for i in rows if node_weights[i] > 0]
+
+        published = index.reindex(columns=[nodes[codes[i]] for i in rows]).rename_axis(columns='Description')
+        computed = index.reindex(columns=[nodes[c] for c in leaves]).to_numpy(dtype=float) @ matrix[rows].T
+        gap = (published - computed) / computed * 100
+        gap = gap.stack(future_stack=True).dropna()
+        gap = gap[gap.abs() > tol].round(2).rename('Gap %').reset_index()
+        gap['Status'] = "inconsistent"
+        frames.append(gap)
+        if unchecked:
+            frames.append(pd.DataFrame({'Date': pd.NaT, 'Description': unchecked, 'Gap %': np.nan, 'Status': "not checked"}))
+    if not frames:
+        return pd.DataFrame(columns=['Date', 'Description', 'Gap %', 'Status'])
+    return pd.concat(frames, ignore_index=True)
+
+
+# Run every check, returns {check name: offending rows}
+def validate(df):
+    df = _clean(df)
+    return {
+        "Duplicate rows": check_duplicates(df),
+        "Missing values": check_completeness(df),
+        "Missing weights": check_missing_weights(df),
+        "Weight sums": check_weight_sums(df),
+        "Parent consistency": check_parent_consistency(df),
+    }
+
+
+def summarize(report):
+    return pd.DataFrame({"Check": list(report), "Issues": [len(rows) for rows in report.values()]})